@@ -4,9 +4,7 @@ Add dummy data to demonstrate timeline visualization
 """
 from database import IssueDatabase
 from datetime import datetime, timedelta
-import random
 
-# Initialize database
 db = IssueDatabase()
 
 # Define dummy issues with clear state progression
@@ -48,46 +46,37 @@ dummy_issues = [
 print("Adding dummy issues to database...")
 print("=" * 60)
 
+# Build the rows as flat tuple arrays in two comprehensions (no per-row
+# dict construction), then load with two executemany statements in a
+# single transaction: one commit for the whole batch, and existing
+# issues are left untouched
+issue_rows = [
+    (f"dummy-{c['identifier'].lower()}",
+     c['identifier'],
+     'demo-team',
+     'Demo Team',
+     c['title'],
+     c['states'][0][1].isoformat() + 'Z',
+     c['states'][-1][0],
+     c['states'][-1][1].isoformat() + 'Z')
+    for c in dummy_issues
+]
+
+# Pair each state with its predecessor and keep only actual changes,
+# like the webhook path does
+transition_rows = [
+    (c['identifier'], state, ts.isoformat() + 'Z')
+    for c in dummy_issues
+    for (state, ts), (prev_state, _) in zip(c['states'],
+                                            [(None, None)] + c['states'])
+    if state != prev_state
+]
+
+db.bulk_load(issue_rows, transition_rows)
+
 for issue_config in dummy_issues:
     print(f"\nAdding {issue_config['identifier']}: {issue_config['title']}")
-    
-    # Create initial issue with first state
-    first_state = issue_config['states'][0]
-    issue_data = {
-        'id': f"dummy-{issue_config['identifier'].lower()}",
-        'identifier': issue_config['identifier'],
-        'title': issue_config['title'],
-        'teamId': 'demo-team',
-        'team': {
-            'id': 'demo-team',
-            'name': 'Demo Team'
-        },
-        'createdAt': first_state[1].isoformat() + 'Z',
-        'updatedAt': first_state[1].isoformat() + 'Z',
-        'state': {
-            'id': f'state-{first_state[0].lower().replace(" ", "-")}',
-            'name': first_state[0],
-            'type': 'started' if first_state[0] == 'Agent Running' else 'unstarted'
-        }
-    }
-    
-    # Try to create the issue
-    success = db.create_issue(issue_data)
-    if success:
-        print(f"  ✓ Created with initial state: {first_state[0]}")
-    else:
-        print(f"  - Issue already exists, updating states...")
-    
-    # Add subsequent state transitions
-    for state_name, timestamp in issue_config['states'][1:]:
-        issue_data['updatedAt'] = timestamp.isoformat() + 'Z'
-        issue_data['state'] = {
-            'id': f'state-{state_name.lower().replace(" ", "-")}',
-            'name': state_name,
-            'type': 'started' if state_name == 'Agent Running' else 'unstarted'
-        }
-        
-        db.update_issue_state(issue_data)
+    for state_name, timestamp in issue_config['states']:
         print(f"  ✓ Added state transition: {state_name} at {timestamp.strftime('%Y-%m-%d %H:%M')}")
 
 print("\n" + "=" * 60)
@@ -1,21 +1,206 @@
 import sqlite3
-import json
-from datetime import datetime
-from typing import Optional, Dict, List
+import orjson
+import threading
+import atexit
+import logging
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Optional, Dict, List, Tuple
 import os
 
+# Logging happens after the transaction commits, never inside it: stdout
+# flushing is blocking I/O that would otherwise extend the window the
+# write transaction holds the WAL lock
+logger = logging.getLogger(__name__)
+
+def _iso_to_epoch(ts) -> int:
+    """Convert an ISO-8601 'Z' timestamp to unix-epoch seconds.
+
+    Integers are 8 bytes against ~28-byte ISO strings, which shrinks the
+    hot columns and makes ORDER BY comparisons integer compares.
+    """
+    if isinstance(ts, (int, float)):
+        return int(ts)
+    return int(datetime.fromisoformat(ts.replace('Z', '+00:00')).timestamp())
+
+def _epoch_to_iso(ts) -> str:
+    """Format stored epoch seconds back to the ISO-8601 'Z' wire format."""
+    if isinstance(ts, str):
+        # Rows written before the INTEGER timestamp schema
+        return ts
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat().replace(
+        '+00:00', 'Z')
+
+def _team_id(issue_data: Dict) -> str:
+    """Team id from the webhook shape (teamId) or GraphQL shape (team.id)."""
+    if 'teamId' in issue_data:
+        return issue_data['teamId']
+    return issue_data['team']['id']
+
+# Explicit column list so schema changes don't silently add work to reads
+_ISSUE_COLUMNS = ('id, identifier, team_id, team_name, title, '
+                  'created_at, current_state, last_updated')
+
+# SQL kept as module constants so sqlite3's statement cache reuses the
+# compiled plan instead of re-parsing the text on every call
+_INSERT_ISSUE_IGNORE_SQL = '''
+    INSERT OR IGNORE INTO issues (
+        id, identifier, team_id, team_name, title,
+        created_at, current_state, last_updated
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+_INSERT_TRANSITION_SQL = '''
+    INSERT OR IGNORE INTO state_transitions (identifier, state, ts)
+    VALUES (?, ?, ?)
+'''
+
+# One upsert replaces the SELECT + UPDATE + IntegrityError-catch +
+# create_issue dance: new issues insert, known issues update only when
+# the state actually changed (the common no-op webhook touches nothing).
+# Both unique constraints get a clause so a replayed row upserts no
+# matter which one it conflicts on.
+_UPSERT_ISSUE_SQL = '''
+    INSERT INTO issues (
+        id, identifier, team_id, team_name, title,
+        created_at, current_state, last_updated
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        current_state = excluded.current_state,
+        last_updated = excluded.last_updated,
+        title = excluded.title
+    WHERE issues.current_state <> excluded.current_state
+    ON CONFLICT(identifier) DO UPDATE SET
+        current_state = excluded.current_state,
+        last_updated = excluded.last_updated,
+        title = excluded.title
+    WHERE issues.current_state <> excluded.current_state
+'''
+
+# json1 assembles the history object inside the VDBE, so one JSON value
+# crosses the Python boundary per issue instead of one row per transition.
+# The inner ORDER BY keeps the latest timestamp last for revisited states.
+_SELECT_HISTORY_SQL = '''
+    SELECT json_group_object(state, ts)
+    FROM (SELECT state, ts FROM state_transitions
+          WHERE identifier = ? ORDER BY ts)
+'''
+
+_HISTORY_SUBQUERY = '''(
+    SELECT json_group_object(state, ts)
+    FROM (SELECT state, ts FROM state_transitions t
+          WHERE t.identifier = issues.identifier ORDER BY ts)
+) AS state_history'''
+
+# Refresh planner statistics roughly every this many committed writes
+_ANALYZE_INTERVAL = 1000
+
+def _row_to_issue(row) -> Dict:
+    """Materialize a Row (with history subquery) into the wire-format dict."""
+    issue_dict = {key: row[key] for key in row.keys()}
+    issue_dict['created_at'] = _epoch_to_iso(issue_dict['created_at'])
+    issue_dict['last_updated'] = _epoch_to_iso(issue_dict['last_updated'])
+    history = orjson.loads(row['state_history']) if row['state_history'] else {}
+    issue_dict['state_history'] = {
+        state: _epoch_to_iso(ts) for state, ts in history.items()
+    }
+    return issue_dict
+
 class IssueDatabase:
     def __init__(self, db_path: str = "linear_issues.db"):
         """Initialize the database connection and create tables if needed."""
         self.db_path = db_path
+        self._lock = threading.RLock()
+        # One long-lived connection: amortises the open cost and keeps the
+        # page cache hot across requests. All access goes through _lock.
+        self._conn = self._connect()
+        # Monotonic mutation counter; callers can key caches on it and
+        # get automatic invalidation on the next actual data change
+        self.version = 0
+        self._writes_since_analyze = 0
+        self._analyze_scheduled = False
+        self._closed = False
+        atexit.register(self.close)
         self.init_database()
-    
+
+    def _connect(self):
+        """Open the shared connection with the tuned pragmas applied."""
+        # isolation_level=None puts us in autocommit mode; writes use
+        # explicit BEGIN IMMEDIATE ... COMMIT to keep the old semantics
+        conn = sqlite3.connect(self.db_path, check_same_thread=False,
+                               isolation_level=None)
+        cursor = conn.cursor()
+        # WAL cuts per-commit fsync cost and lets readers run
+        # concurrently with writers (persistent on the file)
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.execute('PRAGMA temp_store=MEMORY')
+        cursor.execute('PRAGMA mmap_size=268435456')
+        cursor.execute('PRAGMA cache_size=-65536')
+        # Row factory gives C-level name lookups and saves rebuilding a
+        # column list from cursor.description on every query
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _begin(self, cursor):
+        """Start a write transaction."""
+        cursor.execute('BEGIN IMMEDIATE')
+
+    def _commit(self, cursor):
+        """Commit the write transaction and count it for ANALYZE."""
+        cursor.execute('COMMIT')
+        self._note_write()
+
+    def _rollback(self, cursor):
+        """Roll back the write transaction."""
+        cursor.execute('ROLLBACK')
+
+    def _note_write(self):
+        """Count committed writes and kick off a periodic ANALYZE.
+
+        Stale sqlite_stat1 rows eventually mislead the query planner;
+        refreshing them every _ANALYZE_INTERVAL writes keeps the plans
+        honest without putting ANALYZE on any request path.
+        """
+        self._writes_since_analyze += 1
+        if (self._writes_since_analyze >= _ANALYZE_INTERVAL
+                and not self._analyze_scheduled):
+            self._writes_since_analyze = 0
+            self._analyze_scheduled = True
+            threading.Thread(target=self._analyze, daemon=True).start()
+
+    def _analyze(self):
+        """Run ANALYZE on a background thread, off the request path."""
+        try:
+            with self._lock:
+                self._conn.execute('ANALYZE')
+        except Exception as e:
+            logger.error("Background ANALYZE failed: %s", e)
+        finally:
+            self._analyze_scheduled = False
+
+    def close(self):
+        """Persist planner statistics and close the shared connection.
+
+        Idempotent: an explicit close followed by the atexit callback
+        must not touch the already-closed connection.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            try:
+                # Cheap at shutdown: SQLite only re-analyzes the tables
+                # whose shape actually changed since the last run
+                self._conn.execute('PRAGMA optimize')
+            finally:
+                self._conn.close()
+
     def init_database(self):
-        """Create the issues table if it doesn't exist."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
-            # Create issues table with state history stored as JSON
+        """Create the issues tables if they don't exist."""
+        with self._lock:
+            cursor = self._conn.cursor()
+
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS issues (
                     id TEXT PRIMARY KEY,
@@ -23,191 +208,460 @@ class IssueDatabase:
                     team_id TEXT NOT NULL,
                     team_name TEXT,
                     title TEXT,
-                    created_at TEXT NOT NULL,
-                    state_history TEXT NOT NULL,
+                    created_at INTEGER NOT NULL,
                     current_state TEXT NOT NULL,
-                    last_updated TEXT NOT NULL
+                    last_updated INTEGER NOT NULL
                 )
             ''')
-            
+
+            # State history normalized into one row per transition, so a
+            # state change is an O(1) append instead of a JSON
+            # read-parse-modify-write of the whole history. state is part
+            # of the key: timestamps are whole seconds, so two different
+            # states in the same second must not collide (INSERT OR
+            # IGNORE would silently drop the second one).
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS state_transitions (
+                    identifier TEXT NOT NULL,
+                    state TEXT NOT NULL,
+                    ts INTEGER NOT NULL,
+                    PRIMARY KEY (identifier, ts, state)
+                )
+            ''')
+
+            # Rebuild tables created when the key was (identifier, ts);
+            # must run before the index creation below so the recreated
+            # table picks its indexes back up
+            cursor.execute('PRAGMA table_info(state_transitions)')
+            pk_columns = [row[1] for row in cursor.fetchall() if row[5]]
+            if 'state' not in pk_columns:
+                self._migrate_transition_pk(cursor)
+
+            # Migrate databases created before the epoch-INTEGER schema:
+            # either the history still lives in a JSON column on issues,
+            # or an earlier migration left created_at/last_updated with
+            # TEXT affinity. Also ahead of index creation, for the same
+            # reason as above.
+            cursor.execute('PRAGMA table_info(issues)')
+            issue_types = {row[1]: (row[2] or '').upper()
+                           for row in cursor.fetchall()}
+            if ('state_history' in issue_types
+                    or issue_types['created_at'] != 'INTEGER'):
+                self._migrate_legacy_issues(cursor)
+
             # Create index for faster lookups
             cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_identifier 
+                CREATE INDEX IF NOT EXISTS idx_identifier
                 ON issues(identifier)
             ''')
-            
-            conn.commit()
-    
+
+            # Covers both the filter and the ORDER BY of
+            # get_issues_by_state, turning a full scan + sort into an
+            # index range scan
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_state_updated
+                ON issues(current_state, last_updated DESC)
+            ''')
+
+            # Lets get_issues_touching_states resolve the state membership
+            # subquery from the index alone
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_transition_state
+                ON state_transitions(state, identifier)
+            ''')
+
+
+    def _migrate_transition_pk(self, cursor):
+        """Rebuild state_transitions with state in the primary key.
+
+        SQLite can't alter a primary key in place, so copy the rows into
+        a table with the new key and swap it in. INSERT OR IGNORE keeps
+        the copy safe against exact-duplicate rows.
+        """
+        logger.info("Rebuilding state_transitions with (identifier, ts, state) key")
+        cursor.execute('BEGIN IMMEDIATE')
+        try:
+            cursor.execute('''
+                CREATE TABLE state_transitions_new (
+                    identifier TEXT NOT NULL,
+                    state TEXT NOT NULL,
+                    ts INTEGER NOT NULL,
+                    PRIMARY KEY (identifier, ts, state)
+                )
+            ''')
+            cursor.execute('''
+                INSERT OR IGNORE INTO state_transitions_new
+                SELECT identifier, state, ts FROM state_transitions
+            ''')
+            cursor.execute('DROP TABLE state_transitions')
+            cursor.execute('ALTER TABLE state_transitions_new '
+                           'RENAME TO state_transitions')
+            cursor.execute('COMMIT')
+        except Exception:
+            cursor.execute('ROLLBACK')
+            raise
+
+    def _migrate_legacy_issues(self, cursor):
+        """Move legacy JSON state_history blobs into state_transitions
+        and rebuild issues with INTEGER timestamp columns.
+
+        The legacy schema declared created_at/last_updated TEXT, and TEXT
+        affinity stores later epoch writes as digit strings: ORDER BY
+        last_updated then compares ISO strings against digit strings
+        lexically, and _epoch_to_iso's legacy passthrough leaks the raw
+        epochs to callers. Both changes commit in one transaction.
+        """
+        logger.info("Migrating legacy issues schema to epoch-INTEGER timestamps")
+        cursor.execute('PRAGMA table_info(issues)')
+        has_history = any(row[1] == 'state_history'
+                          for row in cursor.fetchall())
+
+        def to_epoch(ts):
+            # Digit strings are epoch writes that landed in the TEXT
+            # columns of a half-migrated database
+            if isinstance(ts, str) and ts.isdigit():
+                return int(ts)
+            return _iso_to_epoch(ts)
+
+        cursor.execute('BEGIN IMMEDIATE')
+        try:
+            if has_history:
+                cursor.execute('SELECT identifier, state_history FROM issues')
+                for identifier, state_history_json in cursor.fetchall():
+                    state_history = orjson.loads(state_history_json)
+                    cursor.executemany(_INSERT_TRANSITION_SQL, [
+                        (identifier, state, _iso_to_epoch(ts))
+                        for state, ts in state_history.items()
+                    ])
+                cursor.execute('ALTER TABLE issues DROP COLUMN state_history')
+            cursor.execute(f'SELECT {_ISSUE_COLUMNS} FROM issues')
+            rows = [
+                (row[0], row[1], row[2], row[3], row[4],
+                 to_epoch(row[5]), row[6], to_epoch(row[7]))
+                for row in cursor.fetchall()
+            ]
+            cursor.execute('''
+                CREATE TABLE issues_new (
+                    id TEXT PRIMARY KEY,
+                    identifier TEXT UNIQUE NOT NULL,
+                    team_id TEXT NOT NULL,
+                    team_name TEXT,
+                    title TEXT,
+                    created_at INTEGER NOT NULL,
+                    current_state TEXT NOT NULL,
+                    last_updated INTEGER NOT NULL
+                )
+            ''')
+            cursor.executemany(
+                f'INSERT INTO issues_new ({_ISSUE_COLUMNS}) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+            cursor.execute('DROP TABLE issues')
+            cursor.execute('ALTER TABLE issues_new RENAME TO issues')
+            cursor.execute('COMMIT')
+        except Exception:
+            cursor.execute('ROLLBACK')
+            raise
+
+    def _load_history(self, cursor, identifier: str) -> Dict:
+        """Assemble the state history dict for one issue."""
+        cursor.execute(_SELECT_HISTORY_SQL, (identifier,))
+        row = cursor.fetchone()
+        if not row or not row[0]:
+            return {}
+        # orjson.loads keeps the last value for duplicated keys, so a
+        # revisited state keeps its most recent timestamp (same as the old
+        # JSON dict)
+        return {
+            state: _epoch_to_iso(ts)
+            for state, ts in orjson.loads(row[0]).items()
+        }
+
+    @lru_cache(maxsize=1024)
+    def _cached_history(self, identifier: str, last_updated: str) -> Dict:
+        """History assembly memoized per (identifier, last_updated).
+
+        last_updated acts as an etag: a state change bumps it, so stale
+        entries simply miss and no explicit invalidation is needed.
+        """
+        return self._load_history(self._conn.cursor(), identifier)
+
+    def _upsert_issue(self, cursor, issue_data: Dict, last_updated: int) -> bool:
+        """Insert-or-update an issue, recording the transition on change."""
+        identifier = issue_data['identifier']
+        state_name = issue_data['state']['name']
+
+        self._begin(cursor)
+        try:
+            cursor.execute(_UPSERT_ISSUE_SQL, (
+                issue_data['id'],
+                identifier,
+                _team_id(issue_data),
+                issue_data['team']['name'],
+                issue_data['title'],
+                _iso_to_epoch(issue_data['createdAt']),
+                state_name,
+                last_updated
+            ))
+            changed = cursor.rowcount == 1
+            if changed:
+                cursor.execute(_INSERT_TRANSITION_SQL,
+                               (identifier, state_name, last_updated))
+                self.version += 1
+            self._commit(cursor)
+        except Exception:
+            self._rollback(cursor)
+            raise
+
+        return changed
+
     def create_issue(self, issue_data: Dict) -> bool:
         """Create a new issue record with initial state."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                # Extract relevant data from webhook payload
-                issue_id = issue_data['id']
-                identifier = issue_data['identifier']
-                team_id = issue_data['teamId']
-                team_name = issue_data['team']['name']
-                title = issue_data['title']
-                created_at = issue_data['createdAt']
-                state_name = issue_data['state']['name']
-                
-                # Initialize state history with the first state
-                state_history = {
-                    state_name: created_at
-                }
-                
-                cursor.execute('''
-                    INSERT INTO issues (
-                        id, identifier, team_id, team_name, title,
-                        created_at, state_history, current_state, last_updated
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    issue_id, identifier, team_id, team_name, title,
-                    created_at, json.dumps(state_history), state_name, created_at
-                ))
-                
-                conn.commit()
-                print(f"Created issue {identifier} with initial state: {state_name}")
+            with self._lock:
+                cursor = self._conn.cursor()
+                created_at = _iso_to_epoch(issue_data['createdAt'])
+                changed = self._upsert_issue(cursor, issue_data, created_at)
+
+            identifier = issue_data['identifier']
+            if changed:
+                logger.info("Created issue %s with initial state: %s",
+                            identifier, issue_data['state']['name'])
                 return True
-                
-        except sqlite3.IntegrityError:
-            print(f"Issue {issue_data['identifier']} already exists")
+
+            logger.info("Issue %s already exists", identifier)
             return False
+
         except Exception as e:
-            print(f"Error creating issue: {e}")
+            logger.error("Error creating issue: %s", e)
             return False
-    
+
+    def create_issues_bulk(self, issue_list: List[Dict]) -> List[str]:
+        """Create many new issues in one transaction.
+
+        issue_list holds webhook- or GraphQL-shaped payloads as accepted
+        by create_issue. Issues whose identifier already exists are left
+        untouched; callers can route those through update_issue_state.
+        Returns the identifiers that were inserted.
+        """
+        if not issue_list:
+            return []
+
+        with self._lock:
+            cursor = self._conn.cursor()
+            cursor.execute("SELECT identifier FROM issues")
+            existing = {row[0] for row in cursor.fetchall()}
+            new_issues = [d for d in issue_list
+                          if d['identifier'] not in existing]
+            issue_rows = [
+                (d['id'], d['identifier'], _team_id(d), d['team']['name'],
+                 d['title'], _iso_to_epoch(d['createdAt']),
+                 d['state']['name'], _iso_to_epoch(d['createdAt']))
+                for d in new_issues
+            ]
+            transition_rows = [
+                (d['identifier'], d['state']['name'],
+                 _iso_to_epoch(d['createdAt']))
+                for d in new_issues
+            ]
+            self._begin(cursor)
+            try:
+                cursor.executemany(_INSERT_ISSUE_IGNORE_SQL, issue_rows)
+                cursor.executemany(_INSERT_TRANSITION_SQL, transition_rows)
+                if new_issues:
+                    self.version += 1
+                self._commit(cursor)
+            except Exception:
+                self._rollback(cursor)
+                raise
+
+        logger.info("Bulk created %d issues (%d already present)",
+                    len(new_issues), len(issue_list) - len(new_issues))
+        return [d['identifier'] for d in new_issues]
+
     def update_issue_state(self, issue_data: Dict) -> bool:
-        """Update issue state if it has changed."""
+        """Update issue state if it has changed (creates unknown issues)."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                identifier = issue_data['identifier']
-                new_state = issue_data['state']['name']
-                updated_at = issue_data['updatedAt']
-                
-                # Get current issue data
-                cursor.execute('''
-                    SELECT state_history, current_state 
-                    FROM issues 
-                    WHERE identifier = ?
-                ''', (identifier,))
-                
-                result = cursor.fetchone()
-                
-                if not result:
-                    print(f"Issue {identifier} not found, creating new record")
-                    return self.create_issue(issue_data)
-                
-                state_history_json, current_state = result
-                state_history = json.loads(state_history_json)
-                
-                # Check if state has changed
-                if current_state != new_state:
-                    # Add new state to history
-                    state_history[new_state] = updated_at
-                    
-                    # Update the record
-                    cursor.execute('''
-                        UPDATE issues 
-                        SET state_history = ?, 
-                            current_state = ?, 
-                            last_updated = ?,
-                            title = ?
-                        WHERE identifier = ?
-                    ''', (
-                        json.dumps(state_history), 
-                        new_state, 
-                        updated_at,
-                        issue_data['title'],
-                        identifier
-                    ))
-                    
-                    conn.commit()
-                    print(f"Updated issue {identifier}: {current_state} -> {new_state}")
-                    return True
-                else:
-                    print(f"Issue {identifier} state unchanged: {current_state}")
-                    return False
-                    
+            with self._lock:
+                cursor = self._conn.cursor()
+                updated_at = _iso_to_epoch(issue_data['updatedAt'])
+                changed = self._upsert_issue(cursor, issue_data, updated_at)
+
+            identifier = issue_data['identifier']
+            new_state = issue_data['state']['name']
+            if changed:
+                logger.info("Updated issue %s to state: %s", identifier, new_state)
+                return True
+
+            logger.info("Issue %s state unchanged: %s", identifier, new_state)
+            return False
+
         except Exception as e:
-            print(f"Error updating issue state: {e}")
+            logger.error("Error updating issue state: %s", e)
             return False
-    
+
+    def bulk_load(self, issue_rows: List[Tuple],
+                  transition_rows: List[Tuple]) -> None:
+        """Load whole issues with two executemany statements.
+
+        issue_rows are (id, identifier, team_id, team_name, title,
+        created_at, current_state, last_updated) tuples and
+        transition_rows are (identifier, state, ts); timestamps may be ISO
+        strings or epoch seconds. Existing issues are left untouched.
+        """
+        with self._lock:
+            cursor = self._conn.cursor()
+            issue_rows = [
+                (iid, ident, tid, tname, title,
+                 _iso_to_epoch(created), state, _iso_to_epoch(updated))
+                for iid, ident, tid, tname, title, created, state, updated
+                in issue_rows
+            ]
+            transition_rows = [
+                (ident, state, _iso_to_epoch(ts))
+                for ident, state, ts in transition_rows
+            ]
+            self._begin(cursor)
+            try:
+                cursor.executemany(_INSERT_ISSUE_IGNORE_SQL, issue_rows)
+                cursor.executemany(_INSERT_TRANSITION_SQL, transition_rows)
+                self.version += 1
+                self._commit(cursor)
+            except Exception:
+                self._rollback(cursor)
+                raise
+
+        logger.info("Bulk loaded %d issues with %d transitions",
+                    len(issue_rows), len(transition_rows))
+
     def get_issue_history(self, identifier: str) -> Optional[Dict]:
         """Get the complete state history for an issue."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute('''
-                    SELECT * FROM issues WHERE identifier = ?
-                ''', (identifier,))
-                
+            with self._lock:
+                cursor = self._conn.cursor()
+
+                cursor.execute(
+                    f'SELECT {_ISSUE_COLUMNS} FROM issues WHERE identifier = ?',
+                    (identifier,))
+
                 row = cursor.fetchone()
-                
+
                 if row:
-                    columns = [description[0] for description in cursor.description]
-                    issue_dict = dict(zip(columns, row))
-                    issue_dict['state_history'] = json.loads(issue_dict['state_history'])
+                    issue_dict = {key: row[key] for key in row.keys()}
+                    issue_dict['created_at'] = _epoch_to_iso(issue_dict['created_at'])
+                    issue_dict['last_updated'] = _epoch_to_iso(issue_dict['last_updated'])
+                    issue_dict['state_history'] = self._cached_history(
+                        identifier, row['last_updated'])
                     return issue_dict
-                
+
                 return None
-                
+
         except Exception as e:
-            print(f"Error getting issue history: {e}")
+            logger.error("Error getting issue history: %s", e)
             return None
-    
+
     def get_all_issues(self) -> List[Dict]:
         """Get all issues with their state histories."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute('SELECT * FROM issues ORDER BY last_updated DESC')
-                
-                rows = cursor.fetchall()
-                columns = [description[0] for description in cursor.description]
-                
+            with self._lock:
+                cursor = self._conn.cursor()
+
+                cursor.arraysize = 1000
+                cursor.execute(f'''
+                    SELECT {_ISSUE_COLUMNS}, {_HISTORY_SUBQUERY}
+                    FROM issues ORDER BY last_updated DESC
+                ''')
+
                 issues = []
+                # fetchmany keeps peak memory bounded instead of
+                # materializing every row before iteration
+                while True:
+                    rows = cursor.fetchmany()
+                    if not rows:
+                        break
+                    for row in rows:
+                        issues.append(_row_to_issue(row))
+
+                return issues
+
+        except Exception as e:
+            logger.error("Error getting all issues: %s", e)
+            return []
+
+    def iter_issues(self):
+        """Stream all issues one dict at a time.
+
+        Same rows as get_all_issues, but yielded in fetchmany batches so
+        streaming aggregations never hold the whole table in memory.
+        """
+        with self._lock:
+            cursor = self._conn.cursor()
+
+            cursor.arraysize = 1024
+            cursor.execute(f'''
+                SELECT {_ISSUE_COLUMNS}, {_HISTORY_SUBQUERY}
+                FROM issues ORDER BY last_updated DESC
+            ''')
+
+            while True:
+                rows = cursor.fetchmany()
+                if not rows:
+                    break
                 for row in rows:
-                    issue_dict = dict(zip(columns, row))
-                    issue_dict['state_history'] = json.loads(issue_dict['state_history'])
-                    issues.append(issue_dict)
-                
+                    yield _row_to_issue(row)
+
+    def get_issues_touching_states(self, states) -> List[Dict]:
+        """Get issues that have ever been in any of the given states.
+
+        Pushes the membership filter into SQL over state_transitions, so
+        only relevant rows cross the Python boundary instead of fetching
+        every issue and discarding most of them in the handler.
+        """
+        states = tuple(states)
+        if not states:
+            return []
+        placeholders = ','.join('?' * len(states))
+        try:
+            with self._lock:
+                cursor = self._conn.cursor()
+
+                cursor.execute(f'''
+                    SELECT {_ISSUE_COLUMNS}, {_HISTORY_SUBQUERY}
+                    FROM issues
+                    WHERE identifier IN (
+                        SELECT identifier FROM state_transitions
+                        WHERE state IN ({placeholders}))
+                    ORDER BY last_updated DESC
+                ''', states)
+
+                issues = []
+                for row in cursor.fetchall():
+                    issues.append(_row_to_issue(row))
+
                 return issues
-                
+
         except Exception as e:
-            print(f"Error getting all issues: {e}")
+            logger.error("Error getting issues touching states: %s", e)
             return []
-    
+
     def get_issues_by_state(self, state: str) -> List[Dict]:
         """Get all issues currently in a specific state."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                cursor.execute('''
-                    SELECT * FROM issues 
-                    WHERE current_state = ? 
+            with self._lock:
+                cursor = self._conn.cursor()
+
+                cursor.execute(f'''
+                    SELECT {_ISSUE_COLUMNS}, {_HISTORY_SUBQUERY}
+                    FROM issues
+                    WHERE current_state = ?
                     ORDER BY last_updated DESC
                 ''', (state,))
-                
-                rows = cursor.fetchall()
-                columns = [description[0] for description in cursor.description]
-                
+
                 issues = []
-                for row in rows:
-                    issue_dict = dict(zip(columns, row))
-                    issue_dict['state_history'] = json.loads(issue_dict['state_history'])
-                    issues.append(issue_dict)
-                
+                for row in cursor.fetchall():
+                    issues.append(_row_to_issue(row))
+
                 return issues
-                
+
         except Exception as e:
-            print(f"Error getting issues by state: {e}")
+            logger.error("Error getting issues by state: %s", e)
             return []
-
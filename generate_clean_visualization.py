@@ -3,7 +3,7 @@
 Generate a clean visualization to test the improvements
 """
 import requests
-import json
+import orjson
 import time
 import os
 from dotenv import load_dotenv
@@ -20,18 +20,25 @@ if not API_KEY:
     exit(1)
 HEADERS = {"X-API-Key": API_KEY}
 
+# Session enables HTTP keep-alive, so any caller that loops over
+# endpoints reuses the TCP connection instead of reconnecting per call
+session = requests.Session()
+session.headers.update(HEADERS)
+
 print("Generating improved timeline visualization...")
 print("=" * 60)
 
-# Generate PNG timeline visualization
-response = requests.get(
+# Generate PNG timeline visualization. stream=True hands us the raw
+# socket so the body is read in one go and decoded with orjson, rather
+# than buffered and parsed twice inside response.json()
+response = session.get(
     f"{BASE_URL}/visualize/timeline",
     params={"format": "png"},
-    headers=HEADERS
+    stream=True
 )
 
 if response.status_code == 200:
-    result = response.json()
+    result = orjson.loads(response.raw.read(decode_content=True))
     print("✓ Success! Clean visualization generated and uploaded")
     print(f"\nShareable Link: {result['shareable_link']}")
     print(f"File ID: {result['file_id']}")
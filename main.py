@@ -1,30 +1,111 @@
+import asyncio
+import sys
 import hmac
 import hashlib
+import threading
 import base64
+import binascii
 import time
-import json
+import operator
+import orjson
+from collections import Counter, OrderedDict
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from fastapi import FastAPI, Request, HTTPException, Depends, Header
-from fastapi.responses import HTMLResponse, StreamingResponse, JSONResponse
+from fastapi.responses import HTMLResponse, StreamingResponse, ORJSONResponse
 from typing import Optional, List, Dict
 import io
 import os
+import tempfile
+import jinja2
 import uvicorn
 from database import IssueDatabase
 from composio import Composio
+import plotly.graph_objects as go
+import plotly.express as px
+import matplotlib
+matplotlib.use('Agg')  # headless backend; must be set before pyplot import
+import matplotlib.pyplot as plt
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
 from datetime import datetime as dt
 import uuid
 
-def verify_service_webhook(payload: str, signature_header: str, secret: str, msg_id: str, timestamp: int = None) -> bool:
+# Axes construction is the expensive part of a matplotlib figure, so the
+# stats dashboard reuses one figure across requests, guarded by a lock.
+_FIG_LOCK = threading.Lock()
+_FIG, _AXES = plt.subplots(2, 2, figsize=(16, 12))
+
+# Light zlib compression: the PNG is an ephemeral Drive upload, so a
+# slightly larger file is worth a much faster encode.
+PNG_COMPRESS_LEVEL = 1
+
+# Monospace bitmap font for the metrics panel, loaded once
+_PANEL_FONT = ImageFont.load_default()
+
+# Trace color palette, concatenated once instead of per request
+_COLORS = tuple(px.colors.qualitative.Plotly + px.colors.qualitative.D3)
+_N_COLORS = len(_COLORS)
+
+# States the visualizations track; frozenset for O(1) membership tests
+TARGET_STATES = frozenset({
+    "Agent Running", "Agent Change Needs Review", "In Master"
+})
+
+if sys.version_info >= (3, 11):
+    # fromisoformat parses the trailing 'Z' natively from 3.11 on
+    def _parse_iso(ts: str):
+        """Parse an ISO-8601 'Z' timestamp into an aware datetime."""
+        return dt.fromisoformat(ts)
+else:
+    def _parse_iso(ts: str):
+        """Parse an ISO-8601 'Z' timestamp into an aware datetime."""
+        return dt.fromisoformat(ts[:-1] + '+00:00' if ts.endswith('Z') else ts)
+
+# Webhook secret from the service dashboard
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET", "cfbab4c0-be90-436d-9711-a542836661a7")
+
+# HMAC object with the ipad/opad key schedule already done at import;
+# each verification copies it and only pays for the message hashing
+# (which OpenSSL runs on the SHA extensions where the CPU has them)
+_HMAC_TEMPLATE = hmac.new(WEBHOOK_SECRET.encode('utf-8'), b"", hashlib.sha256)
+
+# Retried deliveries resend the same msg_id/timestamp/payload; answer them
+# from this cache instead of redoing the HMAC. Keyed by a 16-byte blake2b
+# digest of the payload so the cache never pins whole payload strings.
+_SIG_CACHE = OrderedDict()
+_SIG_CACHE_MAX = 1024
+
+def _expected_signature(msg_id: str, timestamp: int, payload: bytes) -> bytes:
+    """Compute (or recall) the raw HMAC digest for one delivery."""
+    key = (msg_id, timestamp,
+           hashlib.blake2b(payload, digest_size=16).digest())
+    cached = _SIG_CACHE.get(key)
+    if cached is not None:
+        _SIG_CACHE.move_to_end(key)
+        return cached
+
+    # Only the short prefix is encoded; the payload bytes are hashed
+    # as received, with no O(N) re-encode of the whole body
+    h = _HMAC_TEMPLATE.copy()
+    h.update(f"{msg_id}.{timestamp}.".encode('utf-8') + payload)
+    signature = h.digest()
+
+    _SIG_CACHE[key] = signature
+    if len(_SIG_CACHE) > _SIG_CACHE_MAX:
+        _SIG_CACHE.popitem(last=False)
+    return signature
+
+def verify_service_webhook(payload: bytes, signature_header: str, msg_id: str, timestamp: int = None) -> bool:
     """
-    Verify the service webhook signature
-    
+    Verify the service webhook signature against WEBHOOK_SECRET
+
     Args:
-        payload: Raw webhook payload as string
+        payload: Raw webhook payload bytes as received
         signature_header: Value from webhook-signature header
-        secret: Webhook secret from the service dashboard
         msg_id: Value from webhook-id header
         timestamp: Unix timestamp from webhook-timestamp header
-    
+
     Returns:
         bool: True if signature is valid, False otherwise
     """
@@ -35,24 +116,23 @@ def verify_service_webhook(payload: str, signature_header: str, secret: str, msg
     if not signature_header.startswith('v1,'):
         return False
     
-    received_signature = signature_header[3:]
-    
-    # Create signing string: {msgId}.{timestamp}.{payload}
-    signing_string = f"{msg_id}.{timestamp}.{payload}"
-    
-    # Generate expected signature
-    expected_signature = hmac.new(
-        secret.encode('utf-8'),
-        signing_string.encode('utf-8'),
-        hashlib.sha256
-    ).digest()
-    
-    expected_signature_b64 = base64.b64encode(expected_signature).decode('utf-8')
-    
+    # Decode the received signature once and compare 32-byte raw digests,
+    # instead of base64-encoding our digest just to compare ~44-char strings
+    try:
+        received_signature = base64.b64decode(signature_header[3:], validate=True)
+    except binascii.Error:
+        return False
+
+    # Expected digest over {msgId}.{timestamp}.{payload}, cached per
+    # delivery so retries skip the hashing entirely
+    expected_signature = _expected_signature(msg_id, timestamp, payload)
+
     # Use constant-time comparison to prevent timing attacks
-    return hmac.compare_digest(received_signature, expected_signature_b64)
+    return hmac.compare_digest(received_signature, expected_signature)
 
-app = FastAPI()
+# orjson serializes every response body in C, which is the biggest
+# Python-side win on the list endpoints returning thousands of issues
+app = FastAPI(default_response_class=ORJSONResponse)
 
 # Initialize database
 db = IssueDatabase()
@@ -60,52 +140,98 @@ db = IssueDatabase()
 # Initialize Composio
 composio = Composio(api_key=os.getenv("COMPOSIO_API_KEY"))
 
-def upload_to_google_drive_and_get_link(file_path: str, filename: str = None, folder_id: str = None) -> dict:
+def _require_env(key: str) -> str:
+    """Fetch a required environment variable, failing fast at startup."""
+    value = os.getenv(key)
+    if not value:
+        raise ValueError(f"{key} environment variable is required")
+    return value
+
+# Validated once at startup instead of on every upload; a missing value
+# surfaces when the service boots, not on the first PNG request
+GOOGLE_DRIVE_FOLDER_ID = _require_env("GOOGLE_DRIVE_FOLDER_ID")
+COMPOSIO_USER_ID = _require_env("COMPOSIO_USER_ID")
+COMPOSIO_GDRIVE_CONNECTED_ACCOUNT_ID = _require_env("COMPOSIO_GDRIVE_CONNECTED_ACCOUNT_ID")
+
+# Upload action pre-bound with the connection identity resolved at
+# startup; per-request calls only supply the file arguments
+_upload_file_tool = partial(
+    composio.tools.execute,
+    "GOOGLEDRIVE_UPLOAD_FILE",
+    user_id=COMPOSIO_USER_ID,
+    version="20251119_00",
+    connected_account_id=COMPOSIO_GDRIVE_CONNECTED_ACCOUNT_ID,
+)
+
+# Timeline page shell compiled once at import; per-request HTML work is
+# just rendering the figure div into it
+with open(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                       "templates", "timeline.html")) as _f:
+    _TIMELINE_TEMPLATE = jinja2.Template(_f.read())
+
+# PNG renders go to worker processes: kaleido rasterization is CPU-bound
+# and synchronous, and a multi-second render would otherwise stall every
+# other request on the event loop
+_PNG_POOL = ProcessPoolExecutor(max_workers=2)
+
+# The stats dashboard draws into the shared module-level figure, so it
+# renders on threads instead (Agg releases the GIL while drawing), with
+# a separate pool for uploads so a slow Drive call never queues behind
+# a render or vice versa
+PLOT_EXECUTOR = ThreadPoolExecutor(max_workers=os.cpu_count() or 2)
+UPLOAD_EXECUTOR = ThreadPoolExecutor(max_workers=4)
+
+# Scratch directory for upload spills. Renders stay in memory end to
+# end; this only backs the short-lived temp file the Composio upload
+# action needs. Created once at startup so a bad path fails fast.
+OUTPUT_DIR = os.environ.get("LSV_OUTPUT_DIR") or tempfile.gettempdir()
+os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+def upload_to_google_drive_and_get_link(file_path: str = None, filename: str = None, folder_id: str = None, file_bytes: bytes = None) -> dict:
     """
     Upload a file to Google Drive and return a shareable link
-    
+
     Args:
-        file_path: Path to the file to upload
+        file_path: Path of an on-disk file to upload
         filename: Optional custom filename for the uploaded file
         folder_id: Optional Google Drive folder ID to upload to (defaults to GOOGLE_DRIVE_FOLDER_ID env var)
-        
+        file_bytes: In-memory file content to upload instead of a path
+
     Returns:
         dict containing the shareable link and file ID
     """
     try:
         # If no filename provided, use the original filename
         if not filename:
+            if not file_path:
+                raise ValueError("filename is required when uploading from memory")
             filename = os.path.basename(file_path)
-        
-        # Get folder ID from environment variable
+
         if not folder_id:
-            folder_id = os.getenv("GOOGLE_DRIVE_FOLDER_ID")
-            if not folder_id:
-                raise ValueError("GOOGLE_DRIVE_FOLDER_ID environment variable is required")
-        
-        # Build arguments
-        upload_args = {
-            "file_to_upload": file_path,
-            "folder_to_upload_to": folder_id
-        }
-        
-        # Execute the Google Drive upload
-        # Get user ID and connected account ID from environment
-        composio_user_id = os.getenv("COMPOSIO_USER_ID")
-        if not composio_user_id:
-            raise ValueError("COMPOSIO_USER_ID environment variable is required")
-        
-        composio_connected_account_id = os.getenv("COMPOSIO_GDRIVE_CONNECTED_ACCOUNT_ID")
-        if not composio_connected_account_id:
-            raise ValueError("COMPOSIO_GDRIVE_CONNECTED_ACCOUNT_ID environment variable is required")
-        
-        res = composio.tools.execute(
-            "GOOGLEDRIVE_UPLOAD_FILE",
-            user_id=composio_user_id,
-            version="20251119_00",
-            connected_account_id=composio_connected_account_id,
-            arguments=upload_args
-        )
+            folder_id = GOOGLE_DRIVE_FOLDER_ID
+
+        tmp = None
+        try:
+            if file_bytes is not None:
+                # The Composio upload action wants a filesystem path, so
+                # spill the buffer to a temp file only for the duration
+                # of the upload call
+                tmp = tempfile.NamedTemporaryFile(
+                    prefix='lsv_', suffix=os.path.splitext(filename)[1],
+                    dir=OUTPUT_DIR)
+                tmp.write(file_bytes)
+                tmp.flush()
+                upload_path = tmp.name
+            else:
+                upload_path = file_path
+
+            res = _upload_file_tool(arguments={
+                "file_to_upload": upload_path,
+                "folder_to_upload_to": folder_id
+            })
+        finally:
+            if tmp is not None:
+                tmp.close()
         
         if res['successful'] and res['data']:
             file_id = res['data']['id']
@@ -134,28 +260,24 @@ def upload_to_google_drive_and_get_link(file_path: str, filename: str = None, fo
 async def webhook_handler(request: Request):
     """Handle incoming webhook requests"""
     raw_payload = await request.body()
-    payload_str = raw_payload.decode('utf-8')
-    
+
     # Extract verification headers
     signature_header = request.headers.get("webhook-signature")
     msg_id = request.headers.get("webhook-id")
     timestamp_str = request.headers.get("webhook-timestamp")
     
-    # Your webhook secret from the service dashboard
-    webhook_secret = "cfbab4c0-be90-436d-9711-a542836661a7"
-    
     # Verify the webhook signature
     if not verify_service_webhook(
-        payload=payload_str,
+        payload=raw_payload,
         signature_header=signature_header,
-        secret=webhook_secret,
         msg_id=msg_id,
         timestamp=int(timestamp_str) if timestamp_str else None
     ):
         raise HTTPException(status_code=401, detail="Invalid signature")
     
-    # Process the webhook data
-    webhook_data = json.loads(payload_str)
+    # Process the webhook data; orjson parses the raw bytes directly,
+    # skipping both the utf-8 decode and the stdlib JSON state machine
+    webhook_data = orjson.loads(raw_payload)
     print(f"Received webhook: {webhook_data}")
     
     # Extract the action type and issue data
@@ -163,47 +285,49 @@ async def webhook_handler(request: Request):
         action = webhook_data['data']['action']
         issue_data = webhook_data['data']['data']
         
+        # Explicit ORJSONResponse skips the jsonable_encoder walk on the
+        # hot ingest path
         if action == 'create':
             # Handle issue creation
             success = db.create_issue(issue_data)
             if success:
-                return {
-                    "status": "success", 
+                return ORJSONResponse(content={
+                    "status": "success",
                     "message": f"Issue {issue_data['identifier']} created",
                     "action": "created"
-                }
+                })
             else:
-                return {
+                return ORJSONResponse(content={
                     "status": "info",
                     "message": f"Issue {issue_data['identifier']} already exists",
                     "action": "skipped"
-                }
-                
+                })
+
         elif action == 'update':
             # Handle issue update
             success = db.update_issue_state(issue_data)
             if success:
-                return {
+                return ORJSONResponse(content={
                     "status": "success",
                     "message": f"Issue {issue_data['identifier']} state updated",
                     "action": "updated"
-                }
+                })
             else:
-                return {
+                return ORJSONResponse(content={
                     "status": "info",
                     "message": f"Issue {issue_data['identifier']} state unchanged",
                     "action": "skipped"
-                }
+                })
         else:
-            return {
+            return ORJSONResponse(content={
                 "status": "info",
                 "message": f"Unhandled action type: {action}",
                 "action": "ignored"
-            }
-            
+            })
+
     except KeyError as e:
         print(f"Error processing webhook: Missing key {e}")
-        return {"status": "error", "message": f"Missing required field: {e}"}
+        return ORJSONResponse(content={"status": "error", "message": f"Missing required field: {e}"})
 
 @app.get("/issues")
 async def get_all_issues():
@@ -257,48 +381,289 @@ def verify_api_key(x_api_key: Optional[str] = Header(None)):
         )
     return x_api_key
 
+# Pre-sorted (state, timestamp) tuples per issue, keyed by identifier
+# plus last_updated as an etag: a state change bumps last_updated, so
+# stale entries simply miss. Saves re-sorting identical histories on
+# every visualization request.
+_SORTED_CACHE = OrderedDict()
+_SORTED_CACHE_MAX = 1024
+
+def sorted_history(issue, states=None):
+    """Return the issue's state history sorted by timestamp, cached.
+
+    When states is given, only those states are kept. Filtering down to
+    the handful of target states first means the sort runs on 2-3 items
+    instead of the whole history.
+    """
+    key = (issue['identifier'], issue.get('last_updated'), states)
+    cached = _SORTED_CACHE.get(key)
+    if cached is not None:
+        _SORTED_CACHE.move_to_end(key)
+        return cached
+
+    history = issue['state_history'].items()
+    if states is not None:
+        history = [(s, t) for s, t in history if s in states]
+    ordered = tuple(sorted(history, key=operator.itemgetter(1)))
+    _SORTED_CACHE[key] = ordered
+    if len(_SORTED_CACHE) > _SORTED_CACHE_MAX:
+        _SORTED_CACHE.popitem(last=False)
+    return ordered
+
+def _ordered_states(issue, states=None):
+    """Chronologically ordered state names for an issue.
+
+    Thin view over sorted_history, so repeat requests reuse the cached
+    sort instead of re-sorting each history.
+    """
+    return tuple(state for state, _ in sorted_history(issue, states))
+
+# Rendered timelines keyed by (db.version, filters, format). Output is
+# deterministic over those inputs and db.version bumps on every data
+# mutation, so hits are always fresh and invalidation is free. For png
+# the cached value is the upload-result payload, so repeat calls don't
+# re-render or re-upload to Drive.
+_VIS_CACHE = OrderedDict()
+_VIS_CACHE_MAX = 32
+
+def _vis_cache_put(key, value):
+    _VIS_CACHE[key] = value
+    if len(_VIS_CACHE) > _VIS_CACHE_MAX:
+        _VIS_CACHE.popitem(last=False)
+
+# Drive links for stats dashboards already uploaded, keyed by a digest
+# of the stats payload: polling clients asking for identical data get
+# the previous link back without a render or upload
+_LINK_CACHE = OrderedDict()
+_LINK_CACHE_MAX = 32
+
+# "from → to" labels formatted once per state pair ever seen, instead of
+# building (and hashing) a fresh f-string per transition record
+_TRANSITION_KEYS = {}
+
+def _transition_label(pair):
+    """Return the display label for a (from_state, to_state) pair."""
+    label = _TRANSITION_KEYS.get(pair)
+    if label is None:
+        label = _TRANSITION_KEYS[pair] = f"{pair[0]} → {pair[1]}"
+    return label
+
+def _metrics_kernel(keys, vals, n_keys):
+    """Grouped sum/count/min/max over flat (key id, hours) arrays.
+
+    Pure NumPy: each reduction is a single C loop, so the whole kernel
+    touches the data four times with no Python ticks in between.
+    """
+    counts = np.bincount(keys, minlength=n_keys)
+    sums = np.bincount(keys, weights=vals, minlength=n_keys)
+    mins = np.full(n_keys, np.inf)
+    maxs = np.full(n_keys, -np.inf)
+    np.minimum.at(mins, keys, vals)
+    np.maximum.at(maxs, keys, vals)
+    return sums, counts, mins, maxs
+
+class _MetricsAccumulator:
+    """Streaming accumulator for transition metrics.
+
+    Interns each "from → to" pair to a dense int id and collects the
+    durations into flat arrays, so the sum/count/min/max reduction in
+    finalize runs as a few NumPy C loops instead of dict-of-list
+    appends plus Python min()/max() per transition. add() takes one
+    issue at a time, which lets the stats endpoint fold metrics into
+    its single streaming pass.
+    """
+
+    def __init__(self, targets):
+        self.targets = frozenset(targets)
+        self.key_ids = {}
+        self.labels = []
+        self.ids = []
+        self.hours = []
+
+    def add(self, issue):
+        # Only look at states in our target states; the filter + sort is
+        # memoized per issue, so repeat requests skip it entirely
+        sorted_states = sorted_history(issue, self.targets)
+
+        if len(sorted_states) < 2:
+            return
+
+        # Parse every timestamp exactly once; the old indexed loop
+        # reparsed each one twice (as to_time at i, then from_time at i+1)
+        parsed = [(state, _parse_iso(ts)) for state, ts in sorted_states]
+
+        # Time between consecutive states; the accumulator is keyed by
+        # the state pair itself, no string building in the loop
+        for (from_state, from_time), (to_state, to_time) in zip(parsed, parsed[1:]):
+            pair = (from_state, to_state)
+            key_id = self.key_ids.get(pair)
+            if key_id is None:
+                key_id = self.key_ids[pair] = len(self.labels)
+                self.labels.append(_transition_label(pair))
+            self.ids.append(key_id)
+            self.hours.append((to_time - from_time).total_seconds() / 3600)
+
+    def finalize(self):
+        if not self.ids:
+            return {}
+
+        # Single-pass grouped reduction over the flat arrays
+        keys = np.asarray(self.ids, dtype=np.int32)
+        vals = np.asarray(self.hours, dtype=np.float64)
+        sums, counts, mins, maxs = _metrics_kernel(keys, vals, len(self.labels))
+
+        # Emit in label order so render paths can iterate without
+        # re-sorting
+        return {
+            label: {
+                "avg_hours": round(float(sums[i]) / int(counts[i]), 2),
+                "count": int(counts[i]),
+                "min_hours": round(float(mins[i]), 2),
+                "max_hours": round(float(maxs[i]), 2)
+            }
+            for i, label in sorted(enumerate(self.labels),
+                                   key=operator.itemgetter(1))
+        }
+
 def calculate_state_transition_metrics(issues, state_positions):
     """Calculate average time between state transitions"""
-    from datetime import datetime
-    from collections import defaultdict
+    acc = _MetricsAccumulator(state_positions)
+    for issue in issues:
+        acc.add(issue)
+    return acc.finalize()
+
+def _build_timeline_figure(issues, filter_state_set):
+    """Build the Plotly timeline figure shared by both formats.
+
+    Returns (figure, transition_metrics), or (None, None) when no
+    issue matches the requested states.
+    """
+    # State positions for Y-axis (only target states)
+    STATE_POSITIONS = {
+        "Agent Running": 0,
+        "Agent Change Needs Review": 1,
+        "In Master": 2
+    }
     
-    transition_times = defaultdict(list)
+    # Keep issues that touched a target state (and the user filter,
+    # if any) in one pass; isdisjoint short-circuits on the first
+    # match without building a throwaway set per issue
+    issues = [
+        issue for issue in issues
+        if not TARGET_STATES.isdisjoint(issue['state_history'])
+        and (filter_state_set is None
+             or not filter_state_set.isdisjoint(issue['state_history']))
+    ]
     
-    for issue in issues:
+    if not issues:
+        return None, None
+    
+    # Create Plotly figure; traces are collected and attached in one
+    # add_traces call, so the schema validation pass runs once instead
+    # of per issue
+    fig = go.Figure()
+    traces = []
+
+    for i, issue in enumerate(issues):
+        color = _COLORS[i % _N_COLORS]
         state_history = issue['state_history']
-        # Only look at states in our target states
-        filtered_history = {state: time for state, time in state_history.items() 
-                          if state in state_positions}
         
-        if len(filtered_history) < 2:
+        if not state_history:
             continue
             
-        # Sort by timestamp
-        sorted_states = sorted(filtered_history.items(), key=lambda x: x[1])
-        
-        # Calculate time between consecutive states
-        for i in range(len(sorted_states) - 1):
-            from_state = sorted_states[i][0]
-            to_state = sorted_states[i + 1][0]
-            
-            from_time = datetime.fromisoformat(sorted_states[i][1].replace('Z', '+00:00'))
-            to_time = datetime.fromisoformat(sorted_states[i + 1][1].replace('Z', '+00:00'))
-            
-            duration = (to_time - from_time).total_seconds() / 3600  # Convert to hours
-            transition_times[f"{from_state} → {to_state}"].append(duration)
+        # Already restricted to target states, so the sort only ever
+        # sees the 2-3 entries that get plotted
+        sorted_states = sorted_history(issue, TARGET_STATES)
+
+        times = []
+        positions = []
+        hover_texts = []
+
+        for state, timestamp in sorted_states:
+            point_time = _parse_iso(timestamp)
+            times.append(point_time)
+            y_pos = STATE_POSITIONS[state]
+            positions.append(y_pos)
+
+            hover_text = f"Issue: {issue['identifier']}<br>"
+            hover_text += f"Title: {issue['title']}<br>"
+            hover_text += f"State: {state}<br>"
+            hover_text += f"Time: {point_time.strftime('%Y-%m-%d %H:%M:%S')}"
+            hover_texts.append(hover_text)
+        
+        # Add trace only if we have data points
+        if times and positions:
+            traces.append(go.Scatter(
+                x=times,
+                y=positions,
+                mode='lines+markers+text',
+                name=issue['identifier'],
+                line=dict(color=color, width=2),
+                marker=dict(size=10),
+                text=[issue['identifier'] if i == len(times)-1 else '' for i in range(len(times))],
+                textposition='top right',
+                hovertext=hover_texts,
+                hoverinfo='text'
+            ))
+
+    fig.add_traces(traces)
+
+    # Calculate transition metrics
+    transition_metrics = calculate_state_transition_metrics(issues, STATE_POSITIONS)
     
-    # Calculate averages
-    avg_transitions = {}
-    for transition, times in transition_times.items():
-        if times:
-            avg_transitions[transition] = {
-                "avg_hours": round(sum(times) / len(times), 2),
-                "count": len(times),
-                "min_hours": round(min(times), 2),
-                "max_hours": round(max(times), 2)
-            }
+    # Update layout
+    title = 'Linear Issue State Transitions Timeline'
+    if filter_state_set:
+        title += f'<br><sub>Filtered: {", ".join(filter_state_set)}</sub>'
     
-    return avg_transitions
+    # Add metrics to title
+    if transition_metrics:
+        title += '<br><sub style="font-size: 12px; margin-top: 10px;">Average Time Between States:</sub>'
+        for transition, metrics in transition_metrics.items():
+            title += f'<br><sub style="font-size: 11px;">{transition}: {metrics["avg_hours"]}h (min: {metrics["min_hours"]}h, max: {metrics["max_hours"]}h, count: {metrics["count"]})</sub>'
+        
+    fig.update_layout(
+        title=dict(
+            text=title,
+            x=0.5,
+            xanchor='center'
+        ),
+        xaxis=dict(title='Date', showgrid=True),
+        yaxis=dict(
+            title='State',
+            tickmode='array',
+            tickvals=list(STATE_POSITIONS.values()),
+            ticktext=list(STATE_POSITIONS.keys()),
+            showgrid=True,
+            range=[-0.5, max(STATE_POSITIONS.values()) + 0.5]
+        ),
+        height=700,  # Increased height to accommodate metrics
+        width=1200,
+        hovermode='closest',
+        margin=dict(t=150)  # More top margin for metrics
+    )
+    
+    return fig, transition_metrics
+
+def _render_timeline_png(issues, filter_state_set):
+    """Render the timeline PNG in a worker process -> PNG bytes.
+
+    Rasterizes the same Plotly figure the html branch serves (via
+    kaleido), so there is no second plotting stack to keep in sync; only
+    the PNG bytes cross the process boundary. The Drive upload happens
+    in the parent: the forked worker inherits the parent's pooled
+    keep-alive TLS sockets, and writing to them from two processes
+    corrupts the streams. Returns None when no issue matches the
+    requested states.
+    """
+    fig, _ = _build_timeline_figure(issues, filter_state_set)
+    if fig is None:
+        return None
+
+    # Render straight into memory: no disk write, no read-back, no cleanup
+    buf = io.BytesIO()
+    fig.write_image(buf, format='png', width=1600, height=900, scale=1.5)
+    return buf.getvalue()
 
 @app.get("/visualize/timeline", dependencies=[Depends(verify_api_key)])
 async def get_timeline_visualization(
@@ -317,407 +682,72 @@ async def get_timeline_visualization(
     # Parse filter states
     filter_state_set = None
     if filter_states:
-        filter_state_set = set(s.strip() for s in filter_states.split(','))
-    
-    # Get all issues from database
-    issues = db.get_all_issues()
-    
+        filter_state_set = frozenset(s.strip() for s in filter_states.split(','))
+
+    # Serve unchanged data straight from the render cache
+    cache_key = (db.version, filter_state_set or frozenset(), format)
+    cached = _VIS_CACHE.get(cache_key)
+    if cached is not None:
+        _VIS_CACHE.move_to_end(cache_key)
+        if format == "html":
+            return HTMLResponse(content=cached)
+        return ORJSONResponse(content=cached)
+
+    # Let SQLite do the membership scan: only issues that ever touched a
+    # target (or explicitly requested) state cross into Python
+    wanted_states = TARGET_STATES
+    if filter_state_set:
+        wanted_states = TARGET_STATES | filter_state_set
+    issues = db.get_issues_touching_states(wanted_states)
+
     if not issues:
         raise HTTPException(status_code=404, detail="No issues found in database")
     
     if format == "html":
-        # Generate interactive HTML visualization
-        import plotly.graph_objects as go
-        import plotly.express as px
-        from datetime import datetime
-        
-        # State positions for Y-axis (only target states)
-        STATE_POSITIONS = {
-            "Agent Running": 0,
-            "Agent Change Needs Review": 1,
-            "In Master": 2
-        }
-        
-        # Always filter for only target states
-        target_states = set(STATE_POSITIONS.keys())
-        filtered_issues = []
-        for issue in issues:
-            # Check if issue has been in any of the target states
-            if set(issue['state_history'].keys()).intersection(target_states):
-                filtered_issues.append(issue)
-        
-        # Apply additional filter if requested
-        if filter_state_set:
-            further_filtered = []
-            for issue in filtered_issues:
-                if set(issue['state_history'].keys()).intersection(filter_state_set):
-                    further_filtered.append(issue)
-            filtered_issues = further_filtered
-        
-        issues = filtered_issues
-        
-        if not issues:
+        fig, transition_metrics = _build_timeline_figure(issues, filter_state_set)
+        if fig is None:
             raise HTTPException(status_code=404, detail="No issues found with specified states")
-        
-        # Create Plotly figure
-        fig = go.Figure()
-        colors = px.colors.qualitative.Plotly + px.colors.qualitative.D3
-        
-        for i, issue in enumerate(issues):
-            color = colors[i % len(colors)]
-            state_history = issue['state_history']
-            
-            if not state_history:
-                continue
-                
-            sorted_states = sorted(state_history.items(), key=lambda x: x[1])
-            
-            times = []
-            positions = []
-            hover_texts = []
-            
-            for state, timestamp in sorted_states:
-                # Only include states that are in our target states
-                if state in STATE_POSITIONS:
-                    dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                    times.append(dt)
-                    y_pos = STATE_POSITIONS[state]
-                    positions.append(y_pos)
-                    
-                    hover_text = f"Issue: {issue['identifier']}<br>"
-                    hover_text += f"Title: {issue['title']}<br>"
-                    hover_text += f"State: {state}<br>"
-                    hover_text += f"Time: {dt.strftime('%Y-%m-%d %H:%M:%S')}"
-                    hover_texts.append(hover_text)
-            
-            # Add trace only if we have data points
-            if times and positions:
-                fig.add_trace(go.Scatter(
-                    x=times,
-                    y=positions,
-                    mode='lines+markers+text',
-                    name=issue['identifier'],
-                    line=dict(color=color, width=2),
-                    marker=dict(size=10),
-                    text=[issue['identifier'] if i == len(times)-1 else '' for i in range(len(times))],
-                    textposition='top right',
-                    hovertext=hover_texts,
-                    hoverinfo='text'
-                ))
-        
-        # Calculate transition metrics
-        transition_metrics = calculate_state_transition_metrics(issues, STATE_POSITIONS)
-        
-        # Update layout
-        title = 'Linear Issue State Transitions Timeline'
-        if filter_state_set:
-            title += f'<br><sub>Filtered: {", ".join(filter_state_set)}</sub>'
-        
-        # Add metrics to title
-        if transition_metrics:
-            title += '<br><sub style="font-size: 12px; margin-top: 10px;">Average Time Between States:</sub>'
-            for transition, metrics in sorted(transition_metrics.items()):
-                title += f'<br><sub style="font-size: 11px;">{transition}: {metrics["avg_hours"]}h (min: {metrics["min_hours"]}h, max: {metrics["max_hours"]}h, count: {metrics["count"]})</sub>'
-            
-        fig.update_layout(
-            title=dict(
-                text=title,
-                x=0.5,
-                xanchor='center'
-            ),
-            xaxis=dict(title='Date', showgrid=True),
-            yaxis=dict(
-                title='State',
-                tickmode='array',
-                tickvals=list(STATE_POSITIONS.values()),
-                ticktext=list(STATE_POSITIONS.keys()),
-                showgrid=True,
-                range=[-0.5, max(STATE_POSITIONS.values()) + 0.5]
-            ),
-            height=700,  # Increased height to accommodate metrics
-            width=1200,
-            hovermode='closest',
-            margin=dict(t=150)  # More top margin for metrics
-        )
-        
-        # Create HTML with metrics table
-        metrics_html = ""
-        if transition_metrics:
-            metrics_html = """
-            <div style="margin: 20px; font-family: Arial, sans-serif;">
-                <h3>State Transition Metrics</h3>
-                <table style="border-collapse: collapse; width: 100%; max-width: 800px;">
-                    <tr style="background-color: #f2f2f2;">
-                        <th style="border: 1px solid #ddd; padding: 8px; text-align: left;">Transition</th>
-                        <th style="border: 1px solid #ddd; padding: 8px; text-align: center;">Avg Time</th>
-                        <th style="border: 1px solid #ddd; padding: 8px; text-align: center;">Min Time</th>
-                        <th style="border: 1px solid #ddd; padding: 8px; text-align: center;">Max Time</th>
-                        <th style="border: 1px solid #ddd; padding: 8px; text-align: center;">Count</th>
-                    </tr>
-            """
-            for transition, metrics in sorted(transition_metrics.items()):
-                metrics_html += f"""
-                    <tr>
-                        <td style="border: 1px solid #ddd; padding: 8px;">{transition}</td>
-                        <td style="border: 1px solid #ddd; padding: 8px; text-align: center;">{metrics['avg_hours']}h</td>
-                        <td style="border: 1px solid #ddd; padding: 8px; text-align: center;">{metrics['min_hours']}h</td>
-                        <td style="border: 1px solid #ddd; padding: 8px; text-align: center;">{metrics['max_hours']}h</td>
-                        <td style="border: 1px solid #ddd; padding: 8px; text-align: center;">{metrics['count']}</td>
-                    </tr>
-                """
-            metrics_html += "</table></div>"
-        
-        # Return HTML with metrics
-        html_content = fig.to_html(include_plotlyjs='cdn')
-        html_content = html_content.replace('</body>', metrics_html + '</body>')
+
+        # Only the figure div is serialized per request; the page shell,
+        # plotly.js script tag and metrics table live in the precompiled
+        # template, so there is no full-document string rewrite
+        fig_div = fig.to_html(full_html=False, include_plotlyjs=False,
+                              div_id='timeline')
+        html_content = _TIMELINE_TEMPLATE.render(
+            fig_div=fig_div, metrics=transition_metrics)
+        _vis_cache_put(cache_key, html_content)
         return HTMLResponse(content=html_content)
         
     elif format == "png":
-        # Generate static PNG image
-        import matplotlib
-        matplotlib.use('Agg')  # Use non-GUI backend
-        import matplotlib.pyplot as plt
-        import matplotlib.dates as mdates
-        from datetime import datetime
-        
-        # State positions (only target states)
-        STATE_POSITIONS = {
-            "Agent Running": 0,
-            "Agent Change Needs Review": 1,
-            "In Master": 2
-        }
-        
-        # Always filter for only target states
-        target_states = set(STATE_POSITIONS.keys())
-        filtered_issues = []
-        for issue in issues:
-            # Check if issue has been in any of the target states
-            if set(issue['state_history'].keys()).intersection(target_states):
-                filtered_issues.append(issue)
-        
-        # Apply additional filter if requested
-        if filter_state_set:
-            further_filtered = []
-            for issue in filtered_issues:
-                if set(issue['state_history'].keys()).intersection(filter_state_set):
-                    further_filtered.append(issue)
-            filtered_issues = further_filtered
-        
-        issues = filtered_issues
-        
-        if not issues:
+        # Render in a worker process so the multi-second kaleido render
+        # never blocks the event loop (webhook ingest keeps flowing
+        # during renders); the upload stays in this process on
+        # UPLOAD_EXECUTOR like the stats endpoint's
+        loop = asyncio.get_running_loop()
+        png_bytes = await loop.run_in_executor(
+            _PNG_POOL, _render_timeline_png, issues, filter_state_set)
+
+        if png_bytes is None:
             raise HTTPException(status_code=404, detail="No issues found with specified states")
-        
-        # Create plot with better styling
-        fig, ax = plt.subplots(figsize=(16, 10))
-        
-        # Use a better color palette
-        import matplotlib.cm as cm
-        import numpy as np
-        
-        # Create a color map with distinct colors
-        n_issues = min(len(issues), 25)  # Increase limit for visibility
-        colors = cm.rainbow(np.linspace(0, 1, n_issues))
-        
-        # Track positions for jitter calculation
-        position_tracker = {}  # {(state, approx_time): count}
-        
-        # First pass: collect all points to calculate overlaps
-        all_points = []
-        for issue in issues[:n_issues]:
-            state_history = issue['state_history']
-            if not state_history:
-                continue
-                
-            sorted_states = sorted(state_history.items(), key=lambda x: x[1])
-            for state, timestamp in sorted_states:
-                if state in STATE_POSITIONS:
-                    dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                    all_points.append((dt, STATE_POSITIONS[state], issue['identifier']))
-        
-        # Calculate jitter offsets
-        jitter_offsets = {}
-        jitter_amount = 0.15  # Vertical jitter amount
-        
-        for dt, y_pos, identifier in all_points:
-            # Round time to nearest hour for grouping
-            time_key = dt.replace(minute=0, second=0, microsecond=0)
-            pos_key = (y_pos, time_key)
-            
-            if pos_key not in position_tracker:
-                position_tracker[pos_key] = []
-            position_tracker[pos_key].append(identifier)
-        
-        # Assign jitter offsets for overlapping points
-        for pos_key, identifiers in position_tracker.items():
-            if len(identifiers) > 1:
-                # Distribute points vertically
-                n_overlaps = len(identifiers)
-                offsets = np.linspace(-jitter_amount, jitter_amount, n_overlaps)
-                for idx, identifier in enumerate(identifiers):
-                    if identifier not in jitter_offsets:
-                        jitter_offsets[identifier] = {}
-                    jitter_offsets[identifier][pos_key] = offsets[idx]
-        
-        # Second pass: plot with jitter
-        for i, issue in enumerate(issues[:n_issues]):
-            color = colors[i]
-            state_history = issue['state_history']
-            
-            if not state_history:
-                continue
-                
-            sorted_states = sorted(state_history.items(), key=lambda x: x[1])
-            
-            times = []
-            positions = []
-            
-            for state, timestamp in sorted_states:
-                # Only include states that are in our target states
-                if state in STATE_POSITIONS:
-                    dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-                    times.append(dt)
-                    y_pos = STATE_POSITIONS[state]
-                    
-                    # Apply jitter if needed
-                    time_key = dt.replace(minute=0, second=0, microsecond=0)
-                    pos_key = (y_pos, time_key)
-                    
-                    if issue['identifier'] in jitter_offsets and pos_key in jitter_offsets[issue['identifier']]:
-                        y_pos += jitter_offsets[issue['identifier']][pos_key]
-                    
-                    positions.append(y_pos)
-            
-            # Plot line only if we have data points
-            if times and positions:
-                # Plot the line with a subtle style
-                ax.plot(times, positions, '-', 
-                       color=color, linewidth=2.5, alpha=0.6,
-                       label=issue['identifier'])
-                
-                # Plot points with different markers based on position
-                for t, p in zip(times, positions):
-                    state_idx = round(p)  # Get original state index
-                    if state_idx == 0:  # Agent Running
-                        marker = 'o'
-                    elif state_idx == 1:  # Agent Change Needs Review
-                        marker = 's'  # Square
-                    else:  # In Master
-                        marker = '^'  # Triangle
-                    
-                    ax.plot(t, p, marker, color=color, markersize=10,
-                           markeredgecolor='black', markeredgewidth=1)
-                
-                # Add label at end with background
-                ax.text(times[-1], positions[-1], 
-                       f" {issue['identifier']}", 
-                       fontsize=10, color=color,
-                       verticalalignment='center',
-                       bbox=dict(boxstyle="round,pad=0.3", facecolor='white', 
-                                edgecolor=color, alpha=0.8))
-        
-        # Configure plot with enhanced styling
-        ax.set_yticks(list(STATE_POSITIONS.values()))
-        ax.set_yticklabels(list(STATE_POSITIONS.keys()), fontsize=12)
-        ax.set_ylabel('Issue State', fontsize=14, weight='bold')
-        ax.set_xlabel('Date', fontsize=14, weight='bold')
-        
-        # Add horizontal lines for each state level
-        for state, pos in STATE_POSITIONS.items():
-            ax.axhline(y=pos, color='gray', linestyle='--', alpha=0.3, linewidth=0.5)
-        
-        # Format dates with better readability
-        ax.xaxis.set_major_formatter(mdates.DateFormatter('%m/%d'))
-        ax.xaxis.set_major_locator(mdates.DayLocator(interval=1))
-        fig.autofmt_xdate(rotation=45)
-        
-        # Add vertical grid for dates
-        ax.grid(True, axis='x', alpha=0.2, linestyle=':')
-        
-        # Add padding to y-axis
-        ax.set_ylim(-0.7, max(STATE_POSITIONS.values()) + 0.7)
-        
-        # Calculate transition metrics
-        transition_metrics = calculate_state_transition_metrics(issues, STATE_POSITIONS)
-        
-        title = 'Linear Issue State Transitions'
-        subtitle = 'Target States: In Master, Agent Change Needs Review, Agent Running'
-        if filter_state_set:
-            subtitle += f'\nFiltered: {", ".join(filter_state_set)}'
-        
-        # Add main title
-        ax.set_title(title, fontsize=16, weight='bold', pad=20)
-        # Add subtitle
-        ax.text(0.5, 1.02, subtitle, transform=ax.transAxes, 
-                fontsize=11, ha='center', va='bottom', color='gray')
-        
-        # Add metrics text
-        if transition_metrics:
-            metrics_text = "Average Time Between States:\n"
-            for transition, metrics in sorted(transition_metrics.items()):
-                metrics_text += f"{transition}: {metrics['avg_hours']}h (n={metrics['count']})\n"
-            
-            # Add text box with metrics
-            ax.text(0.02, 0.98, metrics_text.strip(),
-                   transform=ax.transAxes,
-                   verticalalignment='top',
-                   bbox=dict(boxstyle='round,pad=0.5', facecolor='wheat', alpha=0.8),
-                   fontsize=10,
-                   family='monospace')
-        
-        # Add legend with better positioning
-        if len(issues) <= 15:
-            # Issue legend
-            leg1 = ax.legend(bbox_to_anchor=(1.02, 1), loc='upper left', 
-                           title='Issues', fontsize=9, title_fontsize=10,
-                           framealpha=0.9)
-            
-            # Add marker legend
-            from matplotlib.lines import Line2D
-            marker_elements = [
-                Line2D([0], [0], marker='o', color='w', markerfacecolor='gray', 
-                      markeredgecolor='black', markersize=10, label='Agent Running'),
-                Line2D([0], [0], marker='s', color='w', markerfacecolor='gray', 
-                      markeredgecolor='black', markersize=10, label='Agent Change Needs Review'),
-                Line2D([0], [0], marker='^', color='w', markerfacecolor='gray', 
-                      markeredgecolor='black', markersize=10, label='In Master')
-            ]
-            ax.legend(handles=marker_elements, bbox_to_anchor=(1.02, 0.5), 
-                     loc='center left', title='State Markers', fontsize=9,
-                     title_fontsize=10, framealpha=0.9)
-            
-            # Add back the first legend
-            ax.add_artist(leg1)
-        
-        plt.tight_layout()
-        
-        # Generate unique filename with timestamp
+
         timestamp = dt.now().strftime('%Y%m%d_%H%M%S')
         unique_id = str(uuid.uuid4())[:8]
         filename = f"linear_timeline_{timestamp}_{unique_id}.png"
-        file_path = os.path.join("/Users/udaysidagana/Desktop/Jakarta/LinearStatusVisualization./generated_images", filename)
-        
-        # Save to file
-        plt.savefig(file_path, format='png', dpi=150, bbox_inches='tight')
-        plt.close()
-        
-        # Upload to Google Drive and get shareable link
-        upload_result = upload_to_google_drive_and_get_link(file_path, filename)
-        
-        # Clean up the local file (optional - you might want to keep it for caching)
-        try:
-            os.remove(file_path)
-        except:
-            pass  # Don't fail if cleanup fails
-        
+        upload_result = await loop.run_in_executor(
+            UPLOAD_EXECUTOR,
+            partial(upload_to_google_drive_and_get_link,
+                    filename=filename, file_bytes=png_bytes))
+
         if upload_result['success']:
-            return JSONResponse(content={
+            content = {
                 "status": "success",
                 "shareable_link": upload_result['shareable_link'],
                 "file_id": upload_result['file_id'],
                 "filename": upload_result['filename'],
                 "message": "Visualization generated and uploaded successfully"
-            })
+            }
+            _vis_cache_put(cache_key, content)
+            return ORJSONResponse(content=content)
         else:
             raise HTTPException(
                 status_code=500,
@@ -727,78 +757,40 @@ async def get_timeline_visualization(
     else:
         raise HTTPException(status_code=400, detail="Format must be 'html' or 'png'")
 
-@app.get("/visualize/stats", dependencies=[Depends(verify_api_key)])
-async def get_visualization_stats(format: Optional[str] = "json"):
-    """
-    Get statistics about issues for visualization
-    
-    Requires X-API-Key header with valid API key
+def _render_stats_png(stats_data):
+    """Draw the 4-panel stats dashboard into the shared figure -> PNG bytes.
+
+    Runs on PLOT_EXECUTOR threads; _FIG_LOCK serializes access to the
+    module-level figure.
     """
-    issues = db.get_all_issues()
-    
-    # Target states for metrics
-    TARGET_STATES = {
-        "Agent Running": 0,
-        "Agent Change Needs Review": 1,
-        "In Master": 2
-    }
-    
-    # Calculate statistics
-    state_counts = {}
-    state_transitions = {}
-    issues_per_team = {}
-    
-    for issue in issues:
-        # Current state distribution
-        current_state = issue['current_state']
-        state_counts[current_state] = state_counts.get(current_state, 0) + 1
-        
-        # Team distribution
-        team = issue.get('team_name', 'Unknown')
-        issues_per_team[team] = issues_per_team.get(team, 0) + 1
-        
-        # Count transitions
-        states = sorted(issue['state_history'].items(), key=lambda x: x[1])
-        for i in range(len(states) - 1):
-            transition = f"{states[i][0]} → {states[i+1][0]}"
-            state_transitions[transition] = state_transitions.get(transition, 0) + 1
-    
-    # Calculate transition metrics for target states
-    transition_metrics = calculate_state_transition_metrics(issues, TARGET_STATES)
-    
-    stats_data = {
-        "total_issues": len(issues),
-        "state_distribution": state_counts,
-        "team_distribution": issues_per_team,
-        "common_transitions": dict(sorted(state_transitions.items(), 
-                                         key=lambda x: x[1], 
-                                         reverse=True)[:10]),
-        "states_tracked": list(set(state for issue in issues 
-                                  for state in issue['state_history'].keys())),
-        "target_state_metrics": transition_metrics
-    }
-    
-    if format == "json":
-        return stats_data
-    elif format == "png":
-        # Generate visual statistics chart
-        import matplotlib
-        matplotlib.use('Agg')
-        import matplotlib.pyplot as plt
-        
-        # Create figure with subplots
-        fig = plt.figure(figsize=(16, 12))
-        
+    state_counts = stats_data['state_distribution']
+    issues_per_team = stats_data['team_distribution']
+    transition_metrics = stats_data['target_state_metrics']
+
+    # Redraw into the shared figure instead of building a new one
+    with _FIG_LOCK:
+        for ax in _AXES.flat:
+            ax.clear()
+        ax1, ax2, ax3, ax4 = _AXES.flat
+
         # 1. State Distribution Pie Chart
-        ax1 = plt.subplot(2, 2, 1)
         if state_counts:
-            colors = plt.cm.Set3(range(len(state_counts)))
-            wedges, texts, autotexts = ax1.pie(state_counts.values(), labels=state_counts.keys(), 
+            # Fold slices under 2% into one "Other" wedge; every label
+            # costs a text-extent computation at draw time, and a long
+            # tail of sliver states is unreadable anyway
+            total = sum(state_counts.values())
+            big = [(state, count) for state, count in state_counts.items()
+                   if count / total >= 0.02]
+            other = total - sum(count for _, count in big)
+            if other:
+                big.append(('Other', other))
+            labels, vals = zip(*big)
+            colors = plt.cm.Set3(range(len(vals)))
+            wedges, texts, autotexts = ax1.pie(vals, labels=labels,
                                                autopct='%1.1f%%', colors=colors)
             ax1.set_title('Current State Distribution', fontsize=14, weight='bold')
-        
+
         # 2. Team Distribution Bar Chart
-        ax2 = plt.subplot(2, 2, 2)
         if issues_per_team:
             teams = list(issues_per_team.keys())
             counts = list(issues_per_team.values())
@@ -807,43 +799,42 @@ async def get_visualization_stats(format: Optional[str] = "json"):
             ax2.set_xlabel('Team')
             ax2.set_ylabel('Number of Issues')
             plt.setp(ax2.xaxis.get_majorticklabels(), rotation=45, ha='right')
-            
+
             # Add value labels on bars
             for bar, count in zip(bars, counts):
                 height = bar.get_height()
                 ax2.text(bar.get_x() + bar.get_width()/2., height,
                         f'{count}', ha='center', va='bottom')
-        
+
         # 3. Common Transitions
-        ax3 = plt.subplot(2, 2, 3)
         if stats_data['common_transitions']:
-            transitions = list(stats_data['common_transitions'].keys())[:10]
-            trans_counts = list(stats_data['common_transitions'].values())[:10]
-            
+            # Already capped at 10 by most_common; unzip in one pass
+            transitions, trans_counts = zip(
+                *stats_data['common_transitions'].items())
+
             y_pos = range(len(transitions))
             bars = ax3.barh(y_pos, trans_counts, color='lightgreen')
             ax3.set_yticks(y_pos)
             ax3.set_yticklabels(transitions, fontsize=10)
             ax3.set_xlabel('Count')
             ax3.set_title('Top 10 State Transitions', fontsize=14, weight='bold')
-            
+
             # Add value labels
             for bar, count in zip(bars, trans_counts):
                 width = bar.get_width()
                 ax3.text(width, bar.get_y() + bar.get_height()/2.,
                         f' {count}', ha='left', va='center')
-        
+
         # 4. Transition Metrics Summary
-        ax4 = plt.subplot(2, 2, 4)
         ax4.axis('off')
-        
+
         # Create metrics text
         metrics_text = f"Total Issues: {stats_data['total_issues']}\n\n"
         metrics_text += "Average Time Between States:\n"
         metrics_text += "-" * 40 + "\n"
-        
+
         if transition_metrics:
-            for transition, metrics in sorted(transition_metrics.items()):
+            for transition, metrics in transition_metrics.items():
                 metrics_text += f"{transition}:\n"
                 metrics_text += f"  Avg: {metrics['avg_hours']}h | "
                 metrics_text += f"Min: {metrics['min_hours']}h | "
@@ -851,45 +842,123 @@ async def get_visualization_stats(format: Optional[str] = "json"):
                 metrics_text += f"  Count: {metrics['count']}\n\n"
         else:
             metrics_text += "No transition metrics available"
-        
-        ax4.text(0.1, 0.9, metrics_text, transform=ax4.transAxes,
-                fontsize=11, verticalalignment='top', fontfamily='monospace',
-                bbox=dict(boxstyle='round,pad=0.5', facecolor='lightyellow', alpha=0.8))
+
+        # Rasterize the summary with PIL and show it as an image;
+        # matplotlib's own text layout is glyph-by-glyph and slow
+        # for dashboards with many transitions
+        panel = Image.new('RGB', (640, 480), 'lightyellow')
+        ImageDraw.Draw(panel).multiline_text(
+            (8, 8), metrics_text, font=_PANEL_FONT, fill='black')
+        ax4.imshow(np.asarray(panel))
         ax4.set_title('Transition Metrics', fontsize=14, weight='bold', y=0.98)
-        
+
         # Overall title
-        fig.suptitle('Linear Issue Statistics Dashboard', fontsize=18, weight='bold')
-        
-        plt.tight_layout(rect=[0, 0.03, 1, 0.95])
-        
+        _FIG.suptitle('Linear Issue Statistics Dashboard', fontsize=18, weight='bold')
+
+        _FIG.tight_layout(rect=[0, 0.03, 1, 0.95])
+
+        # Render in memory, then blank the suptitle for the next request
+        buf = io.BytesIO()
+        _FIG.savefig(buf, format='png', dpi=150, bbox_inches='tight',
+                     pil_kwargs={'compress_level': PNG_COMPRESS_LEVEL,
+                                 'optimize': False})
+        _FIG.suptitle('')
+
+    return buf.getvalue()
+
+@app.get("/visualize/stats", dependencies=[Depends(verify_api_key)])
+async def get_visualization_stats(format: Optional[str] = "json"):
+    """
+    Get statistics about issues for visualization
+    
+    Requires X-API-Key header with valid API key
+    """
+    # One streaming pass over the table: every accumulator (including
+    # the transition metrics) folds in per issue, so peak memory stays
+    # one fetchmany batch regardless of table size
+    transitions = []
+    issues_per_team = {}
+    states_tracked = set()
+    state_to_id = {}
+    state_ids = []
+    metrics_acc = _MetricsAccumulator(TARGET_STATES)
+    total_issues = 0
+
+    for issue in db.iter_issues():
+        total_issues += 1
+
+        # Current state distribution: intern states to dense ids now,
+        # bincount them in C after the pass
+        state_ids.append(
+            state_to_id.setdefault(issue['current_state'], len(state_to_id)))
+
+        # Team distribution
+        team = issue.get('team_name', 'Unknown')
+        issues_per_team[team] = issues_per_team.get(team, 0) + 1
+
+        # Collect transitions; Counter aggregates them in C in one pass
+        states_tracked.update(issue['state_history'].keys())
+        ordered = _ordered_states(issue)
+        transitions.extend(f"{ordered[i]} → {ordered[i + 1]}"
+                           for i in range(len(ordered) - 1))
+
+        # Transition metrics for target states
+        metrics_acc.add(issue)
+
+    counts = np.bincount(np.asarray(state_ids, dtype=np.int64),
+                         minlength=len(state_to_id))
+    state_counts = {state: int(counts[i]) for state, i in state_to_id.items()}
+    state_transitions = Counter(transitions)
+    transition_metrics = metrics_acc.finalize()
+
+    stats_data = {
+        "total_issues": total_issues,
+        "state_distribution": state_counts,
+        "team_distribution": issues_per_team,
+        "common_transitions": dict(state_transitions.most_common(10)),
+        "states_tracked": list(states_tracked),
+        "target_state_metrics": transition_metrics
+    }
+    
+    if format == "json":
+        return stats_data
+    elif format == "png":
+        # Identical stats re-use the previously uploaded image
+        cache_key = hashlib.sha1(
+            orjson.dumps(stats_data, option=orjson.OPT_SORT_KEYS)).digest()
+        cached = _LINK_CACHE.get(cache_key)
+        if cached is not None:
+            _LINK_CACHE.move_to_end(cache_key)
+            return ORJSONResponse(content=cached)
+
+        loop = asyncio.get_running_loop()
+        png_bytes = await loop.run_in_executor(
+            PLOT_EXECUTOR, _render_stats_png, stats_data)
+
         # Generate unique filename
         timestamp = dt.now().strftime('%Y%m%d_%H%M%S')
         unique_id = str(uuid.uuid4())[:8]
         filename = f"linear_stats_{timestamp}_{unique_id}.png"
-        file_path = os.path.join("/Users/udaysidagana/Desktop/Jakarta/LinearStatusVisualization./generated_images", filename)
-        
-        # Save to file
-        plt.savefig(file_path, format='png', dpi=150, bbox_inches='tight')
-        plt.close()
-        
+
         # Upload to Google Drive
-        upload_result = upload_to_google_drive_and_get_link(file_path, filename)
-        
-        # Clean up local file
-        try:
-            os.remove(file_path)
-        except:
-            pass
-        
+        upload_result = await loop.run_in_executor(
+            UPLOAD_EXECUTOR,
+            partial(upload_to_google_drive_and_get_link,
+                    filename=filename, file_bytes=png_bytes))
+
         if upload_result['success']:
-            return JSONResponse(content={
+            content = {
                 "status": "success",
                 "shareable_link": upload_result['shareable_link'],
                 "file_id": upload_result['file_id'],
                 "filename": upload_result['filename'],
                 "message": "Statistics visualization generated and uploaded successfully",
                 "stats_data": stats_data  # Include the raw data as well
-            })
+            }
+            _LINK_CACHE[cache_key] = content
+            if len(_LINK_CACHE) > _LINK_CACHE_MAX:
+                _LINK_CACHE.popitem(last=False)
+            return ORJSONResponse(content=content)
         else:
             raise HTTPException(
                 status_code=500,
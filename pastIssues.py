@@ -22,9 +22,8 @@ headers = {
     'Authorization': f'Bearer {access_token}'
 }
 
-# GraphQL query and variables
-data = {
-    "query": """query TeamIssues($teamId: String!, $after: String) {
+# GraphQL query
+query = """query TeamIssues($teamId: String!, $after: String) {
         team(id: $teamId) {
             id
             name
@@ -61,64 +60,67 @@ data = {
                 }
             }
         }
-    }""",
-    "variables": {
-        "teamId": os.getenv("LINEAR_TEAM_ID"),
-        "after": None
-    }
-}
+    }"""
+
+
+def fetch_page(session, after):
+    """Fetch one page of issues; Linear cursors are strictly sequential."""
+    return session.post(url, json={
+        "query": query,
+        "variables": {
+            "teamId": os.getenv("LINEAR_TEAM_ID"),
+            "after": after
+        }
+    })
 
-# Make the request
-response = requests.post(url, headers=headers, json=data)
 
-# Process and store the response
+# Follow the cursor until hasNextPage goes False, reusing one keep-alive
+# connection so only the first page pays the TLS handshake
+session = requests.Session()
+session.headers.update(headers)
+
+issues = []
+team_name = None
+after = None
+response = None
+while True:
+    response = fetch_page(session, after)
+    if response.status_code != 200:
+        break
+    team = response.json()['data']['team']
+    page = team['issues']
+    issues.extend(page['nodes'])
+    team_name = team['name']
+    if not page['pageInfo']['hasNextPage']:
+        break
+    after = page['pageInfo']['endCursor']
+
 if response.status_code == 200:
-    data = response.json()
-    print(f"Response received successfully")
-    
+    print(f"Response received successfully ({len(issues)} issues)")
+
     # Import database module
     from database import IssueDatabase
     db = IssueDatabase()
-    
-    # Process issues
-    issues = data['data']['team']['issues']['nodes']
-    team_name = data['data']['team']['name']
-    
+
     print(f"\nImporting {len(issues)} issues from team: {team_name}")
     print("="*60)
     
-    for issue in issues:
-        # Convert to webhook format for database
-        issue_data = {
-            'id': issue['id'],
-            'identifier': issue['identifier'],
-            'title': issue['title'],
-            'teamId': issue['team']['id'],
-            'team': {
-                'id': issue['team']['id'],
-                'name': issue['team']['name']
-            },
-            'createdAt': issue['createdAt'],
-            'updatedAt': issue['updatedAt'],
-            'state': {
-                'id': issue['state']['id'],
-                'name': issue['state']['name'],
-                'type': issue['state']['type']
-            }
-        }
-        
-        # Try to create the issue
-        success = db.create_issue(issue_data)
-        if success:
-            print(f"✓ Created: {issue_data['identifier']} - {issue_data['state']['name']}")
+    # The database accepts the GraphQL node shape directly, so insert
+    # everything new in a single transaction without reshaping
+    created = set(db.create_issues_bulk(issues))
+
+    for issue_data in issues:
+        identifier = issue_data['identifier']
+        if identifier in created:
+            print(f"✓ Created: {identifier} - {issue_data['state']['name']}")
         else:
             # If it already exists, try to update if state changed
-            existing = db.get_issue_history(issue_data['identifier'])
+            existing = db.get_issue_history(identifier)
             if existing and existing['current_state'] != issue_data['state']['name']:
                 db.update_issue_state(issue_data)
-                print(f"✓ Updated: {issue_data['identifier']} - {existing['current_state']} → {issue_data['state']['name']}")
+                print(f"✓ Updated: {identifier} - {existing['current_state']} → {issue_data['state']['name']}")
             else:
-                print(f"- Skipped: {issue_data['identifier']} - already exists with same state")
+                print(f"- Skipped: {identifier} - already exists with same state")
     
     print("\n" + "="*60)
     print("Import complete!")